@@ -2,16 +2,91 @@
 
 from __future__ import annotations
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    ATTR_COUNT,
+    ATTR_ENABLED,
+    CONF_STEAM_ID,
+    DATA_PROFILER,
+    DATA_UNLOCK_INDEXES,
+    DOMAIN,
+    PLATFORMS,
+    SERVICE_CAPTURE_PROFILE,
+    SERVICE_GET_PROFILING_STATS,
+    SERVICE_GET_RECENT_UNLOCKS,
+    SERVICE_SET_PROFILING,
+)
+from .profiling import UpdateProfiler
+from .unlocks import STORAGE_VERSION, storage_key
+
+SET_PROFILING_SCHEMA = vol.Schema({vol.Required(ATTR_ENABLED): cv.boolean})
+CAPTURE_PROFILE_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.entity_ids})
+GET_RECENT_UNLOCKS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_COUNT, default=10): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(CONF_STEAM_ID): cv.string,
+    }
+)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Steam Tracker integration (YAML not supported)."""
     hass.data.setdefault(DOMAIN, {})
+    # kept outside hass.data[DOMAIN], which maps entry_id to entry data
+    profiler = UpdateProfiler(hass)
+    hass.data[DATA_PROFILER] = profiler
+    indexes = hass.data.setdefault(DATA_UNLOCK_INDEXES, {})
+
+    async def async_set_profiling(call: ServiceCall) -> None:
+        """Switch update timing spans on or off."""
+        profiler.set_enabled(call.data[ATTR_ENABLED])
+
+    async def async_capture_profile(call: ServiceCall) -> None:
+        """Write cProfile output for the next update of the given sensors."""
+        profiler.request_capture(call.data.get(ATTR_ENTITY_ID))
+
+    async def async_get_profiling_stats(call: ServiceCall) -> ServiceResponse:
+        """Return the collected update timings."""
+        return {"enabled": profiler.enabled, "entities": profiler.stats()}
+
+    async def async_get_recent_unlocks(call: ServiceCall) -> ServiceResponse:
+        """Return the most recent achievement unlocks, newest first."""
+        count = call.data[ATTR_COUNT]
+        steam_id = call.data.get(CONF_STEAM_ID)
+        unlocks = []
+        for index_steam_id, index in indexes.items():
+            if steam_id is None or steam_id == index_steam_id:
+                unlocks.extend({**u, CONF_STEAM_ID: index_steam_id} for u in index.recent(count))
+        unlocks.sort(key=lambda u: u["unlocktime"], reverse=True)
+        return {"unlocks": unlocks[:count]}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PROFILING, async_set_profiling, schema=SET_PROFILING_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CAPTURE_PROFILE, async_capture_profile, schema=CAPTURE_PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PROFILING_STATS,
+        async_get_profiling_stats,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_RECENT_UNLOCKS,
+        async_get_recent_unlocks,
+        schema=GET_RECENT_UNLOCKS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     return True
 
 
@@ -30,3 +105,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted unlock index of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.data[CONF_STEAM_ID])).async_remove()
@@ -6,3 +6,13 @@ DOMAIN = "steam_tracker"
 CONF_STEAM_ID = "steam_id"
 DEFAULT_NAME = "Steam Tracker"
 PLATFORMS = [Platform.SENSOR]
+
+DATA_PROFILER = f"{DOMAIN}_profiler"
+ATTR_ENABLED = "enabled"
+SERVICE_SET_PROFILING = "set_profiling"
+SERVICE_CAPTURE_PROFILE = "capture_profile"
+SERVICE_GET_PROFILING_STATS = "get_profiling_stats"
+
+DATA_UNLOCK_INDEXES = f"{DOMAIN}_unlock_indexes"
+ATTR_COUNT = "count"
+SERVICE_GET_RECENT_UNLOCKS = "get_recent_unlocks"
@@ -0,0 +1,216 @@
+"""Opt-in timing spans and cProfile capture for sensor updates."""
+
+from __future__ import annotations
+
+import cProfile
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+import logging
+from pathlib import Path
+import threading
+import time
+from typing import Any, Iterator
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASE_FETCH = "fetch"
+PHASE_DECODE = "decode"
+PHASE_COMPUTE = "compute"
+PHASE_STATE_WRITE = "state_write"
+PHASE_TOTAL = "total"
+
+
+@dataclass
+class UpdateCycle:
+    """Timing spans collected during one ``update()`` call."""
+
+    spans: dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Add the time spent inside the block to ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[phase] = self.spans.get(phase, 0.0) + time.perf_counter() - start
+
+
+@dataclass
+class PhaseStats:
+    """Aggregated timings of one phase."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.last = seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "last_ms": round(self.last * 1000, 2),
+        }
+
+
+class UpdateProfiler:
+    """Collect timing spans and one-shot cProfile dumps for sensor updates."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self.enabled = False
+        self._stats: dict[str, dict[str, PhaseStats]] = {}
+        self._capture_all = False
+        self._capture: set[str] = set()
+        self._lock = threading.Lock()
+        # Since Python 3.12 cProfile uses sys.monitoring: only one profiler
+        # may be active and it records every thread, not just the update.
+        self._cprofile_lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Switch timing spans on or off; switching on clears old stats."""
+        with self._lock:
+            if enabled and not self.enabled:
+                self._stats.clear()
+            self.enabled = enabled
+
+    def request_capture(self, entity_ids: Iterable[str] | None = None) -> None:
+        """Capture cProfile output while the next update of the entities runs.
+
+        On Python 3.12+ the dump is process wide: it also contains other
+        executor jobs and event loop work that ran during that update.
+        """
+        with self._lock:
+            if entity_ids is None:
+                self._capture_all = True
+            else:
+                self._capture.update(entity_ids)
+
+    def wants(self, entity_id: str | None) -> bool:
+        """Return True if the next update of ``entity_id`` should be profiled."""
+        return self.enabled or self._capture_all or entity_id in self._capture
+
+    def stats(self) -> dict[str, Any]:
+        """Return aggregated timings per entity and phase."""
+        with self._lock:
+            return {
+                entity_id: {phase: stats.as_dict() for phase, stats in phases.items()}
+                for entity_id, phases in self._stats.items()
+            }
+
+    def record(self, entity_id: str | None, phase: str, seconds: float) -> None:
+        """Record a single span outside of an update cycle."""
+        if not self.enabled or entity_id is None:
+            return
+        with self._lock:
+            self._stats.setdefault(entity_id, {}).setdefault(phase, PhaseStats()).add(seconds)
+
+    def run(self, entity: Any, func: Callable[[Any], None]) -> None:
+        """Run ``func(entity)`` with spans and, if requested, cProfile."""
+        entity_id = entity.entity_id
+        profile = self._take_capture(entity_id)
+        if profile is not None:
+            try:
+                profile.enable()
+            except ValueError as e:
+                # e.g. Home Assistant's own profiler.start is running
+                _LOGGER.warning("Not capturing a profile for %s: %s", entity_id, e)
+                self._cprofile_lock.release()
+                profile = None
+
+        cycle = UpdateCycle()
+        entity._profile_cycle = cycle
+        start = time.perf_counter()
+        try:
+            func(entity)
+        finally:
+            if profile is not None:
+                profile.disable()
+            total = time.perf_counter() - start
+            entity._profile_cycle = None
+            if profile is not None:
+                self._cprofile_lock.release()
+                self._dump(profile, entity)
+
+        fetch = cycle.spans.get(PHASE_FETCH, 0.0)
+        decode = cycle.spans.get(PHASE_DECODE, 0.0)
+        compute = max(0.0, total - fetch - decode)
+        if self.enabled:
+            with self._lock:
+                phases = self._stats.setdefault(entity_id, {})
+                for phase, seconds in (
+                    (PHASE_FETCH, fetch),
+                    (PHASE_DECODE, decode),
+                    (PHASE_COMPUTE, compute),
+                    (PHASE_TOTAL, total),
+                ):
+                    phases.setdefault(phase, PhaseStats()).add(seconds)
+        _LOGGER.debug(
+            "Update of %s took %.1f ms (fetch %.1f, decode %.1f, compute %.1f)",
+            entity_id,
+            total * 1000,
+            fetch * 1000,
+            decode * 1000,
+            compute * 1000,
+        )
+
+    def _take_capture(self, entity_id: str | None) -> cProfile.Profile | None:
+        """Claim a pending capture for ``entity_id`` if cProfile is free."""
+        with self._lock:
+            if not (self._capture_all or entity_id in self._capture):
+                return None
+            if not self._cprofile_lock.acquire(blocking=False):
+                # Another update is being profiled; keep the request pending.
+                return None
+            self._capture_all = False
+            self._capture.discard(entity_id)
+        return cProfile.Profile()
+
+    def _dump(self, profile: cProfile.Profile, entity: Any) -> None:
+        """Write cProfile output below ``<config>/steam_tracker/profiles``.
+
+        The file name says ``process_during`` because the profile covers all
+        threads for the duration of the update, not the update alone.
+        """
+        directory = Path(self._hass.config.path(DOMAIN, "profiles"))
+        name = entity.unique_id or entity.entity_id or type(entity).__name__
+        path = directory / f"process_during_{name}_{datetime.now():%Y%m%d_%H%M%S}.prof"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError as e:
+            _LOGGER.error("Error writing profile for %s: %s", entity.entity_id, e)
+            return
+        _LOGGER.info(
+            "Wrote process wide profile taken during the update of %s to %s (includes other threads)",
+            entity.entity_id,
+            path,
+        )
+
+
+def profiled_update(func: Callable[[Any], None]) -> Callable[[Any], None]:
+    """Wrap a sensor ``update()`` so the profiler can time it when enabled."""
+
+    @wraps(func)
+    def wrapper(self: Any) -> None:
+        profiler = self.profiler
+        if profiler is None or not profiler.wants(self.entity_id):
+            func(self)
+            return
+        profiler.run(self, func)
+
+    return wrapper
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import timedelta
 
 import requests
@@ -13,9 +14,18 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_NAME
 from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
-from .const import CONF_STEAM_ID, DEFAULT_NAME
+from .const import CONF_STEAM_ID, DATA_PROFILER, DATA_UNLOCK_INDEXES, DEFAULT_NAME
+from .profiling import (
+    PHASE_DECODE,
+    PHASE_FETCH,
+    PHASE_STATE_WRITE,
+    UpdateProfiler,
+    profiled_update,
+)
+from .unlocks import STORAGE_VERSION, UnlockIndex, storage_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +52,7 @@ def _create_entities(api_key: str, steam_id: str, name: str) -> list["SteamBaseS
         SteamRecentAchievementsSensor(api_key, steam_id, f"{base_name} Recent Achievements"),
         SteamGlobalStatsSensor(api_key, steam_id, f"{base_name} Global Stats"),
         SteamFriendsSensor(api_key, steam_id, f"{base_name} Friends"),
+        SteamRecentUnlocksSensor(api_key, steam_id, f"{base_name} Recent Unlocks"),
     ]
 
 
@@ -84,6 +95,8 @@ class SteamBaseSensor(SensorEntity):
         self._attr_unique_id = f"{steam_id}_{self.sensor_type}"
         self._state = None
         self._attrs = {}
+        self._profile_cycle = None
+        self._device_update_seconds = 0.0
 
     @property
     def native_value(self):
@@ -93,13 +106,62 @@ class SteamBaseSensor(SensorEntity):
     def extra_state_attributes(self):
         return self._attrs
 
+    @property
+    def profiler(self) -> UpdateProfiler | None:
+        """Return the integration profiler once the entity is added."""
+        if self.hass is None:
+            return None
+        return self.hass.data.get(DATA_PROFILER)
+
+    def _fetch(self, url, **kwargs) -> requests.Response:
+        """GET ``url``, timed as the fetch phase while profiling."""
+        if self._profile_cycle is None:
+            return requests.get(url, **kwargs)
+        with self._profile_cycle.span(PHASE_FETCH):
+            return requests.get(url, **kwargs)
+
+    def _decode(self, response: requests.Response):
+        """Decode a JSON response, timed as the decode phase while profiling."""
+        if self._profile_cycle is None:
+            return response.json()
+        with self._profile_cycle.span(PHASE_DECODE):
+            return response.json()
+
+    async def async_device_update(self, warning: bool = True) -> None:
+        """Run the update, remembering how long it took."""
+        start = time.perf_counter()
+        try:
+            await super().async_device_update(warning)
+        finally:
+            self._device_update_seconds = time.perf_counter() - start
+
+    async def async_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Update and write the state, timed as the state_write phase while profiling.
+
+        Polling calls this instead of ``async_write_ha_state``, so the write
+        is the time spent here minus the update itself.
+        """
+        profiler = self.profiler
+        if profiler is None or not profiler.enabled:
+            await super().async_update_ha_state(force_refresh)
+            return
+        self._device_update_seconds = 0.0
+        start = time.perf_counter()
+        await super().async_update_ha_state(force_refresh)
+        profiler.record(
+            self.entity_id,
+            PHASE_STATE_WRITE,
+            max(0.0, time.perf_counter() - start - self._device_update_seconds),
+        )
+
+    @profiled_update
     def update(self):
         """Fetch data from Steam API."""
         try:
             params = {"key": self._api_key, "steamids": self._steam_id}
-            response = requests.get(API_URL, params=params, timeout=10)
+            response = self._fetch(API_URL, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()["response"]["players"][0]
+            data = self._decode(response)["response"]["players"][0]
             self.parse_data(data)
         except Exception as e:
             _LOGGER.error("Error fetching data from Steam: %s", e)
@@ -162,9 +224,9 @@ class SteamGameSensor(SteamBaseSensor):
                 "include_appinfo": False,
                 "include_played_free_games": True,
             }
-            resp = requests.get(API_OWNED_GAMES, params=params, timeout=10)
+            resp = self._fetch(API_OWNED_GAMES, params=params, timeout=10)
             resp.raise_for_status()
-            games = resp.json().get("response", {}).get("games", [])
+            games = self._decode(resp).get("response", {}).get("games", [])
             for g in games:
                 if str(g.get("appid")) == current_game_id:
                     hours = round(g.get("playtime_forever", 0) / 60, 1)
@@ -182,6 +244,7 @@ class SteamPlaytimeSensor(SteamBaseSensor):
     sensor_type = "playtime"
     SCAN_INTERVAL = timedelta(hours=3)
 
+    @profiled_update
     def update(self):
         """Fetch owned games and playtime data from Steam API."""
         try:
@@ -191,9 +254,9 @@ class SteamPlaytimeSensor(SteamBaseSensor):
                 "include_appinfo": True,   # liefert Namen der Spiele
                 "include_played_free_games": True
             }
-            response = requests.get(API_OWNED_GAMES, params=params, timeout=15)
+            response = self._fetch(API_OWNED_GAMES, params=params, timeout=15)
             response.raise_for_status()
-            data = response.json()["response"]
+            data = self._decode(response)["response"]
 
             games = data.get("games", [])
             if not games:
@@ -253,9 +316,9 @@ class SteamPlaytimeSensor(SteamBaseSensor):
                         "steamid": self._steam_id,
                         "appid": appid,
                     }
-                    user_resp = requests.get(API_ACHIEVEMENTS, params=user_params, timeout=10)
+                    user_resp = self._fetch(API_ACHIEVEMENTS, params=user_params, timeout=10)
                     if user_resp.ok:
-                        user_data = user_resp.json().get("playerstats", {})
+                        user_data = self._decode(user_resp).get("playerstats", {})
                         achs = user_data.get("achievements", [])
                         unlocked = sum(1 for a in achs if a.get("achieved") == 1)
                         total = len(achs)
@@ -298,12 +361,13 @@ class SteamProfileSensor(SteamBaseSensor):
 
     sensor_type = "profile"
     SCAN_INTERVAL = timedelta(hours=3)
+    @profiled_update
     def update(self):
         try:
             params = {"key": self._api_key, "steamid": self._steam_id}
-            response = requests.get(API_BADGES, params=params, timeout=10)
+            response = self._fetch(API_BADGES, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json().get("response", {})
+            data = self._decode(response).get("response", {})
 
             self._state = data.get("player_level", 0)
             self._attrs = {
@@ -324,6 +388,7 @@ class SteamRecentGamesSensor(SteamBaseSensor):
     sensor_type = "recent_games"
     SCAN_INTERVAL = timedelta(minutes=10)
     
+    @profiled_update
     def update(self):
         try:
             params = {
@@ -331,9 +396,9 @@ class SteamRecentGamesSensor(SteamBaseSensor):
                 "steamid": self._steam_id,
                 "count": 5,  # nur die letzten 5 Spiele
             }
-            response = requests.get(API_RECENT_GAMES, params=params, timeout=10)
+            response = self._fetch(API_RECENT_GAMES, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json().get("response", {})
+            data = self._decode(response).get("response", {})
 
             games = data.get("games", [])
             if not games:
@@ -378,6 +443,7 @@ class SteamRecentAchievementsSensor(SteamBaseSensor):
     sensor_type = "recent_achievements"
     SCAN_INTERVAL = timedelta(hours=3)
 
+    @profiled_update
     def update(self):
         try:
             params = {
@@ -385,9 +451,9 @@ class SteamRecentAchievementsSensor(SteamBaseSensor):
                 "steamid": self._steam_id,
                 "count": 5,  # only check the last 5 games
             }
-            response = requests.get(API_RECENT_GAMES, params=params, timeout=15)
+            response = self._fetch(API_RECENT_GAMES, params=params, timeout=15)
             response.raise_for_status()
-            games = response.json().get("response", {}).get("games", [])
+            games = self._decode(response).get("response", {}).get("games", [])
 
             achievements_data = []
             for g in games:
@@ -401,18 +467,18 @@ class SteamRecentAchievementsSensor(SteamBaseSensor):
                     "appid": appid,
                 }
                 try:
-                    user_resp = requests.get(API_ACHIEVEMENTS, params=user_params, timeout=10)
+                    user_resp = self._fetch(API_ACHIEVEMENTS, params=user_params, timeout=10)
                     user_resp.raise_for_status()
-                    user_data = user_resp.json().get("playerstats", {})
+                    user_data = self._decode(user_resp).get("playerstats", {})
                     unlocked = sum(1 for a in user_data.get("achievements", []) if a.get("achieved") == 1)
                 except Exception:
                     unlocked = None
 
                 # get scheme (overall)
                 try:
-                    schema_resp = requests.get(API_SCHEMA, params={"key": self._api_key, "appid": appid}, timeout=10)
+                    schema_resp = self._fetch(API_SCHEMA, params={"key": self._api_key, "appid": appid}, timeout=10)
                     schema_resp.raise_for_status()
-                    schema_data = schema_resp.json().get("game", {})
+                    schema_data = self._decode(schema_resp).get("game", {})
                     total = len(schema_data.get("availableGameStats", {}).get("achievements", []))
                 except Exception:
                     total = None
@@ -447,6 +513,7 @@ class SteamGlobalStatsSensor(SteamBaseSensor):
     sensor_type = "global_stats"
     SCAN_INTERVAL = timedelta(hours=5)
     
+    @profiled_update
     def update(self):
         try:
             # 1) Alle Spiele abrufen
@@ -456,9 +523,9 @@ class SteamGlobalStatsSensor(SteamBaseSensor):
                 "include_appinfo": True,
                 "include_played_free_games": True,
             }
-            resp = requests.get(API_OWNED_GAMES, params=params, timeout=30)
+            resp = self._fetch(API_OWNED_GAMES, params=params, timeout=30)
             resp.raise_for_status()
-            games = resp.json().get("response", {}).get("games", [])
+            games = self._decode(resp).get("response", {}).get("games", [])
 
             total_unlocked = 0
             total_possible = 0
@@ -477,10 +544,10 @@ class SteamGlobalStatsSensor(SteamBaseSensor):
                         "steamid": self._steam_id,
                         "appid": appid,
                     }
-                    ach_resp = requests.get(API_ACHIEVEMENTS, params=params, timeout=10)
+                    ach_resp = self._fetch(API_ACHIEVEMENTS, params=params, timeout=10)
                     if ach_resp.status_code != 200:
                         continue
-                    ach_data = ach_resp.json().get("playerstats", {})
+                    ach_data = self._decode(ach_resp).get("playerstats", {})
                     achs = ach_data.get("achievements", [])
                     unlocked = sum(1 for a in achs if a.get("achieved") == 1)
                     total = len(achs)
@@ -499,8 +566,8 @@ class SteamGlobalStatsSensor(SteamBaseSensor):
 
             # 3) Badges abrufen
             badge_params = {"key": self._api_key, "steamid": self._steam_id}
-            badge_resp = requests.get(API_BADGES, params=badge_params, timeout=10)
-            badge_data = badge_resp.json().get("response", {})
+            badge_resp = self._fetch(API_BADGES, params=badge_params, timeout=10)
+            badge_data = self._decode(badge_resp).get("response", {})
             badges = badge_data.get("badges", [])
             badge_count = len(badges)
             card_badge_count = len([b for b in badges if "appid" in b])
@@ -530,6 +597,7 @@ class SteamFriendsSensor(SteamBaseSensor):
     sensor_type = "friends"
     SCAN_INTERVAL = timedelta(minutes=5)
 
+    @profiled_update
     def update(self):
         try:
             # step 1: get friends list
@@ -538,9 +606,9 @@ class SteamFriendsSensor(SteamBaseSensor):
                 "steamid": self._steam_id,
                 "relationship": "friend"
             }
-            resp = requests.get(API_FRIENDS, params=params, timeout=15)
+            resp = self._fetch(API_FRIENDS, params=params, timeout=15)
             resp.raise_for_status()
-            friends_data = resp.json().get("friendslist", {}).get("friends", [])
+            friends_data = self._decode(resp).get("friendslist", {}).get("friends", [])
 
             if not friends_data:
                 self._state = 0
@@ -554,9 +622,9 @@ class SteamFriendsSensor(SteamBaseSensor):
             for i in range(0, len(friend_ids), 100):
                 batch_ids = friend_ids[i:i+100]
                 params = {"key": self._api_key, "steamids": ",".join(batch_ids)}
-                info_resp = requests.get(API_SUMMARIES, params=params, timeout=15)
+                info_resp = self._fetch(API_SUMMARIES, params=params, timeout=15)
                 info_resp.raise_for_status()
-                players = info_resp.json().get("response", {}).get("players", [])
+                players = self._decode(info_resp).get("response", {}).get("players", [])
                 for p in players:
                     state_map = {
                         0: "Offline",
@@ -583,3 +651,138 @@ class SteamFriendsSensor(SteamBaseSensor):
             _LOGGER.error("Error fetching friends list: %s", e)
             self._state = None
             self._attrs = {}
+
+MAX_UNLOCK_SCAN_GAMES = 50
+UNLOCK_BACKFILL_INTERVAL = timedelta(minutes=5)
+RECENT_UNLOCKS_COUNT = 10
+
+class SteamRecentUnlocksSensor(SteamBaseSensor):
+    """Shows the latest achievement unlocks across the whole library."""
+
+    sensor_type = "recent_unlocks"
+    SCAN_INTERVAL = timedelta(hours=1)
+
+    def __init__(self, api_key: str, steam_id: str, name: str) -> None:
+        super().__init__(api_key, steam_id, name)
+        self._index = UnlockIndex()
+        self._store: Store | None = None
+        self._last_scan: float | None = None
+        self._pending = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Load the persisted unlock index."""
+        self._store = Store(self.hass, STORAGE_VERSION, storage_key(self._steam_id))
+        if (data := await self._store.async_load()) is not None:
+            self._index = UnlockIndex.from_dict(data)
+        self.hass.data.setdefault(DATA_UNLOCK_INDEXES, {})[self._steam_id] = self._index
+
+    async def async_will_remove_from_hass(self) -> None:
+        self.hass.data.get(DATA_UNLOCK_INDEXES, {}).pop(self._steam_id, None)
+
+    @profiled_update
+    def update(self):
+        # Home Assistant ignores SCAN_INTERVAL on entities and polls every
+        # 30 seconds, so throttle here; scan faster while backfilling.
+        interval = UNLOCK_BACKFILL_INTERVAL if self._pending else self.SCAN_INTERVAL
+        now = time.monotonic()
+        if self._last_scan is not None and now - self._last_scan < interval.total_seconds():
+            return
+        self._last_scan = now
+
+        try:
+            params = {
+                "key": self._api_key,
+                "steamid": self._steam_id,
+                "include_appinfo": True,
+                "include_played_free_games": True,
+            }
+            resp = self._fetch(API_OWNED_GAMES, params=params, timeout=30)
+            resp.raise_for_status()
+            games = self._decode(resp).get("response", {}).get("games", [])
+
+            # only games played since the last scan can have new unlocks
+            changed = self._index.changed_games(games)
+            pending = max(0, len(changed) - MAX_UNLOCK_SCAN_GAMES)
+            self._pending = pending
+            scanned = []
+            unlocks_by_appid = {}
+            for g in changed[:MAX_UNLOCK_SCAN_GAMES]:
+                appid = g["appid"]
+                if not g.get("playtime_forever") and str(appid) not in self._index.games:
+                    # never played, nothing can be unlocked yet
+                    scanned.append(g)
+                    continue
+
+                try:
+                    params = {
+                        "key": self._api_key,
+                        "steamid": self._steam_id,
+                        "appid": appid,
+                        "l": "english",
+                    }
+                    ach_resp = self._fetch(API_ACHIEVEMENTS, params=params, timeout=10)
+                    if ach_resp.status_code == 400:
+                        achs = []  # "Requested app has no stats"
+                    elif ach_resp.ok:
+                        stats = self._decode(ach_resp).get("playerstats", {})
+                        achs = stats.get("achievements", [])
+                    else:
+                        # rate limit, private profile, bad key or server error:
+                        # keep the indexed unlocks and retry on the next update
+                        _LOGGER.debug(
+                            "Achievements for %s returned HTTP %s", appid, ach_resp.status_code
+                        )
+                        continue
+                except Exception as e:
+                    _LOGGER.debug("Error fetching achievements for %s: %s", appid, e)
+                    continue
+
+                scanned.append(g)
+                unlocks_by_appid[str(appid)] = [
+                    {
+                        "appid": appid,
+                        "game": g.get("name"),
+                        "apiname": a.get("apiname"),
+                        "name": a.get("name") or a.get("apiname"),
+                        "unlocktime": a.get("unlocktime", 0),
+                    }
+                    for a in achs
+                    if a.get("achieved") == 1 and a.get("unlocktime")
+                ]
+
+            if scanned:
+                self._index.apply(scanned, unlocks_by_appid)
+                self._async_schedule_save()
+
+            now = time.time()
+            last_30d = self._index.count_since(now - timedelta(days=30).total_seconds())
+            self._state = self._index.count_since(now - timedelta(days=7).total_seconds())
+            self._attrs = {
+                "recent_unlocks": [
+                    {
+                        **u,
+                        "logo": f"https://cdn.cloudflare.steamstatic.com/steam/apps/{u['appid']}/header.jpg",
+                    }
+                    for u in self._index.recent(RECENT_UNLOCKS_COUNT)
+                ],
+                "unlocks_last_24h": self._index.count_since(now - timedelta(days=1).total_seconds()),
+                "unlocks_last_7d": self._state,
+                "unlocks_last_30d": last_30d,
+                "unlocks_per_day_30d": round(last_30d / 30, 2),
+                "unlocks_total": len(self._index.unlocks),
+                "games_indexed": len(self._index.games),
+                "games_scanned": len(scanned),
+                "games_pending": pending,
+            }
+
+        except Exception as e:
+            _LOGGER.error("Error updating achievement unlock index: %s", e)
+            self._state = None
+            self._attrs = {}
+
+    def _async_schedule_save(self) -> None:
+        """Persist a snapshot of the index from the event loop."""
+        if self._store is None:
+            return
+        data = self._index.as_dict()
+        self.hass.loop.call_soon_threadsafe(self._store.async_delay_save, lambda: data, 10)
@@ -0,0 +1,90 @@
+"""Persisted, time-ordered index of achievement unlocks for one account."""
+
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import Any
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+
+def storage_key(steam_id: str) -> str:
+    """Return the ``.storage`` key holding the unlock index of ``steam_id``."""
+    return f"{DOMAIN}.unlocks.{steam_id}"
+
+
+class UnlockIndex:
+    """Unlocked achievements across the whole library, newest first.
+
+    ``games`` remembers the playtime of every game at its last scan, so only
+    games whose playtime changed since then need their achievements fetched
+    again.
+    """
+
+    def __init__(
+        self,
+        games: dict[str, dict[str, Any]] | None = None,
+        unlocks: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.games = games or {}
+        self.unlocks = unlocks or []
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> UnlockIndex:
+        return cls(dict(data.get("games", {})), list(data.get("unlocks", [])))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"games": dict(self.games), "unlocks": list(self.unlocks)}
+
+    def changed_games(self, games: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return owned games whose playtime changed, most recently played first."""
+        changed = [
+            g
+            for g in games
+            if g.get("appid")
+            and self.games.get(str(g["appid"]), {}).get("playtime") != g.get("playtime_forever", 0)
+        ]
+        changed.sort(key=lambda g: g.get("rtime_last_played", 0), reverse=True)
+        return changed
+
+    def apply(
+        self,
+        scanned: list[dict[str, Any]],
+        unlocks_by_appid: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Store the scan result for ``scanned`` games.
+
+        Games missing from ``unlocks_by_appid`` keep their previous unlocks;
+        their playtime is still recorded so they are not scanned again.
+        """
+        games = dict(self.games)
+        for g in scanned:
+            games[str(g["appid"])] = {
+                "name": g.get("name"),
+                "playtime": g.get("playtime_forever", 0),
+            }
+
+        unlocks = [u for u in self.unlocks if str(u["appid"]) not in unlocks_by_appid]
+        for entries in unlocks_by_appid.values():
+            unlocks.extend(entries)
+        unlocks.sort(key=itemgetter("unlocktime"), reverse=True)
+
+        # Swap in complete objects so readers on the event loop never see a
+        # half-updated index.
+        self.games = games
+        self.unlocks = unlocks
+
+    def recent(self, count: int) -> list[dict[str, Any]]:
+        """Return the ``count`` most recent unlocks."""
+        return self.unlocks[:count]
+
+    def count_since(self, timestamp: float) -> int:
+        """Return the number of unlocks at or after ``timestamp``."""
+        count = 0
+        for u in self.unlocks:
+            if u["unlocktime"] < timestamp:
+                break
+            count += 1
+        return count
@@ -0,0 +1,793 @@
+"""Load-test harness for the Steam Tracker integration.
+
+Starts N simulated config entries, each with the entities returned by
+``_create_entities``, against a local mock Steam Web API and polls them the
+way Home Assistant does for a sync ``update()`` platform:
+
+- each entry is its own platform, so its updates are serialized
+  (``PARALLEL_UPDATES`` defaults to 1 for sync entities),
+- a poll tick that fires while the previous one is still running is skipped,
+- ``update()`` runs in a shared thread pool executor,
+- after each update the state and attributes are serialized to JSON on the
+  event loop, standing in for Home Assistant's state write and the
+  serialization for the recorder and websocket subscribers.
+
+The state write is an approximation: the state machine, event bus and
+listeners are not simulated, so loop lag is a lower bound for large
+attribute payloads such as ``Playtime`` and ``Global Stats``.
+
+A simulated day is compressed by ``--time-scale`` (1440 turns a day into one
+minute of wall time). While it runs the harness samples event-loop lag,
+executor queue depth, requests served by the mock API and process RSS.
+Memory is read from RSS rather than tracemalloc, which would slow down every
+allocation in ``update()`` and skew the measured update durations. Growth is
+reported from a baseline taken after every entity has been updated once.
+
+Request latency is not compressed, so at a high scale an entry cannot finish
+its updates within the compressed interval and most ticks are skipped; the
+measurements then reflect the harness, not the integration. By default
+(``--time-scale auto``) a calibration pass updates every entity once and
+picks the highest scale at which the busiest entry still needs no more than
+half of each compressed interval. If that scale would make the run longer
+than ``--max-wall-seconds``, the simulated window is shortened instead of
+compressing further, and the report says how many hours were simulated.
+
+The harness also measures the duration and request count of every update
+per sensor class and projects them onto the real schedule:
+
+- projected requests per minute: requests per update x scheduled updates,
+- entry utilization: update time per interval for one entry; at 1.0 or more
+  the entry cannot keep up even in real time and Home Assistant skips polls,
+- executor threads busy: executor demand of all entries together.
+
+When more than half of the ticks were skipped although an entry keeps up in
+real time, the run is compression dominated: event-loop lag and executor
+queue depth are not reported and a warning names a time scale that works.
+
+Home Assistant only honors a module level ``SCAN_INTERVAL`` on the platform,
+so by default every entity is polled at the sensor default of 30 seconds.
+Use ``--interval-source entity`` to poll with the per-class ``SCAN_INTERVAL``
+values instead.
+
+Usage (needs ``homeassistant`` and ``requests`` installed)::
+
+    python scripts/load_test.py --entries 1,5,10,25,50
+    python scripts/load_test.py --entries 50 --max-wall-seconds 900 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import statistics
+import sys
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+STEAM_API_BASE = "https://api.steampowered.com"
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+SIMULATED_DAY = timedelta(days=1)
+DEFAULT_TIME_SCALE = 1440
+STATS_PATH = "/__stats"
+SENSOR_LOGGER = "custom_components.steam_tracker.sensor"
+BASE_STEAM_ID = 76561198000000000
+
+
+# ---------------------------------------------------------------------------
+# Mock Steam Web API
+# ---------------------------------------------------------------------------
+
+
+def _seed(*parts: Any) -> int:
+    """Return a stable pseudo random number for the given key."""
+    value = 0
+    for char in "/".join(str(p) for p in parts):
+        value = (value * 31 + ord(char)) & 0xFFFFFFFF
+    return value
+
+
+class MockSteamHandler(BaseHTTPRequestHandler):
+    """Serve deterministic Steam Web API responses."""
+
+    server: "MockSteamServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Silence per-request logging."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == STATS_PATH:
+            self._send_json(self.server.snapshot())
+            return
+
+        route = self.server.routes.get(url.path)
+        if route is None:
+            self.send_error(404)
+            return
+
+        self.server.count(url.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self._send_json(route(self.server, query))
+
+    def _send_json(self, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockSteamServer(ThreadingHTTPServer):
+    """Threaded HTTP server that counts requests per endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, games: int, achievements: int, friends: int, latency_ms: float) -> None:
+        super().__init__(("127.0.0.1", 0), MockSteamHandler)
+        self.games = games
+        self.achievements = achievements
+        self.friends = friends
+        self.latency = latency_ms / 1000
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self.routes = {
+            "/ISteamUser/GetPlayerSummaries/v2/": MockSteamServer._player_summaries,
+            "/ISteamUser/GetPlayerSummaries/v0002/": MockSteamServer._player_summaries,
+            "/ISteamUser/GetFriendList/v1/": MockSteamServer._friend_list,
+            "/IPlayerService/GetOwnedGames/v1/": MockSteamServer._owned_games,
+            "/IPlayerService/GetRecentlyPlayedGames/v1/": MockSteamServer._recent_games,
+            "/IPlayerService/GetBadges/v1/": MockSteamServer._badges,
+            "/ISteamUserStats/GetPlayerAchievements/v1/": MockSteamServer._achievements,
+            "/ISteamUserStats/GetSchemaForGame/v2/": MockSteamServer._schema,
+        }
+
+    def count(self, path: str) -> None:
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {"requests": dict(self._counts)}
+
+    def _games(self, steam_id: str) -> list[dict[str, Any]]:
+        return [
+            {
+                "appid": 10 + i * 10,
+                "name": f"Game {i:04d}",
+                "playtime_forever": _seed(steam_id, i) % 20000,
+                "playtime_2weeks": _seed(steam_id, i, "2w") % 600,
+                "rtime_last_played": 1700000000 + _seed(steam_id, i, "last") % 10000000,
+            }
+            for i in range(self.games)
+        ]
+
+    def _player_summaries(self, query: dict[str, str]) -> dict[str, Any]:
+        players = []
+        for steam_id in query.get("steamids", "").split(","):
+            playing = _seed(steam_id, "playing") % 3 == 0
+            players.append(
+                {
+                    "steamid": steam_id,
+                    "personaname": f"player_{steam_id[-4:]}",
+                    "personastate": _seed(steam_id) % 7,
+                    "profileurl": f"https://steamcommunity.com/profiles/{steam_id}/",
+                    "avatarfull": "https://avatars.steamstatic.com/avatar_full.jpg",
+                    "lastlogoff": 1700000000,
+                    "gameid": "10" if playing else None,
+                    "gameextrainfo": "Game 0000" if playing else None,
+                }
+            )
+        return {"response": {"players": players}}
+
+    def _friend_list(self, query: dict[str, str]) -> dict[str, Any]:
+        steam_id = int(query.get("steamid", BASE_STEAM_ID))
+        friends = [
+            {"steamid": str(steam_id + 100000 + i), "relationship": "friend", "friend_since": 0}
+            for i in range(self.friends)
+        ]
+        return {"friendslist": {"friends": friends}}
+
+    def _owned_games(self, query: dict[str, str]) -> dict[str, Any]:
+        games = self._games(query.get("steamid", ""))
+        return {"response": {"game_count": len(games), "games": games}}
+
+    def _recent_games(self, query: dict[str, str]) -> dict[str, Any]:
+        count = int(query.get("count", 5))
+        games = self._games(query.get("steamid", ""))[:count]
+        return {"response": {"total_count": len(games), "games": games}}
+
+    def _badges(self, query: dict[str, str]) -> dict[str, Any]:
+        badges = [{"badgeid": i, "appid": 10 + i * 10} for i in range(10)]
+        return {
+            "response": {
+                "badges": badges,
+                "player_xp": 12345,
+                "player_level": 42,
+                "player_xp_needed_to_level_up": 155,
+                "player_xp_needed_current_level": 12300,
+            }
+        }
+
+    def _achievements(self, query: dict[str, str]) -> dict[str, Any]:
+        steam_id = query.get("steamid", "")
+        appid = query.get("appid", "")
+        achievements = []
+        for i in range(self.achievements):
+            achieved = int(_seed(steam_id, appid, i) % 2)
+            achievements.append(
+                {
+                    "apiname": f"ACH_{i}",
+                    "achieved": achieved,
+                    "unlocktime": 1600000000 + _seed(appid, i) % 100000000 if achieved else 0,
+                }
+            )
+        return {"playerstats": {"steamID": steam_id, "success": True, "achievements": achievements}}
+
+    def _schema(self, query: dict[str, str]) -> dict[str, Any]:
+        achievements = [{"name": f"ACH_{i}"} for i in range(self.achievements)]
+        return {"game": {"availableGameStats": {"achievements": achievements}}}
+
+
+def _serve(ready: Any, games: int, achievements: int, friends: int, latency_ms: float) -> None:
+    """Run the mock API in a child process so it does not share our GIL."""
+    server = MockSteamServer(games, achievements, friends, latency_ms)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _rss_kib() -> float:
+    """Return the resident set size of this process in KiB."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except OSError:
+        # No procfs (macOS): fall back to the peak RSS, reported in bytes there.
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _fetch_stats(base_url: str) -> dict[str, int]:
+    with urlopen(base_url + STATS_PATH, timeout=10) as resp:
+        return json.load(resp)["requests"]
+
+
+# ---------------------------------------------------------------------------
+# Simulated Home Assistant polling
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PollGroup:
+    """Entities polled together on one interval, like an entity platform."""
+
+    entities: list[Any]
+    interval: timedelta
+    semaphore: asyncio.Semaphore
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    ticks: int = 0
+    skipped: int = 0
+
+
+class ErrorCounter(logging.Handler):
+    """Count errors the sensors log instead of raising."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Handler.handle() already holds self.lock around emit().
+        self.count += 1
+
+
+@dataclass
+class UpdateStats:
+    """Completed updates of one sensor class."""
+
+    count: int = 0
+    seconds: float = 0.0
+    requests: int = 0
+
+
+class CountingRequests:
+    """Stand-in for the ``requests`` module that counts GETs per thread."""
+
+    def __init__(self, module: Any) -> None:
+        self._module = module
+        self._local = threading.local()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._module, name)
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        self._local.count = self.count() + 1
+        return self._module.get(*args, **kwargs)
+
+    def count(self) -> int:
+        return getattr(self._local, "count", 0)
+
+    def reset(self) -> None:
+        self._local.count = 0
+
+
+@dataclass
+class RunResult:
+    """Measurements for a single run."""
+
+    entries: int
+    entities: int
+    wall_seconds: float
+    time_scale: float
+    simulated_hours: float
+    updates_completed: int
+    update_errors: int
+    ticks: int
+    ticks_skipped: int
+    update_seconds_mean: float
+    update_seconds_max: float
+    state_write_ms_mean: float
+    state_write_ms_max: float
+    loop_lag_ms_mean: float | None
+    loop_lag_ms_p99: float | None
+    loop_lag_ms_max: float | None
+    executor_queue_mean: float | None
+    executor_queue_max: int | None
+    requests_total: int
+    requests_per_sim_minute: float
+    requests_per_wall_minute: float
+    requests_by_endpoint: dict[str, int]
+    projected_requests_per_minute: float
+    projected_entry_utilization_max: float
+    projected_executor_threads_busy: float
+    suggested_max_time_scale: float | None
+    compression_dominated: bool
+    updates_by_sensor: dict[str, dict[str, float]]
+    memory_entities_kib: float
+    memory_start_kib: float
+    memory_end_kib: float
+    memory_peak_kib: float
+    memory_growth_kib: float
+    memory_samples_kib: list[float]
+
+
+class LoadTest:
+    """Drive the sensor entities of N simulated entries for up to one simulated day."""
+
+    def __init__(self, args: argparse.Namespace, base_url: str, counter: CountingRequests) -> None:
+        self.args = args
+        self.base_url = base_url
+        self.counter = counter
+        self.scale: float | None = args.time_scale
+        self.sim_seconds = SIMULATED_DAY.total_seconds()
+        self.executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="SyncWorker")
+        self.errors = ErrorCounter()
+        self.update_times: list[float] = []
+        self.state_write_times: list[float] = []
+        self.update_stats: dict[str, UpdateStats] = {}
+        self._stats_lock = threading.Lock()
+        self.lags: list[float] = []
+        self.queue_depths: list[int] = []
+        self.memory_samples: list[float] = []
+        self._stop = asyncio.Event()
+
+    def _build_groups(self, sensor: Any, entries: int) -> list[PollGroup]:
+        groups = []
+        for index in range(entries):
+            steam_id = str(BASE_STEAM_ID + index)
+            entities = sensor._create_entities(f"key-{index}", steam_id, f"Load {index}")
+            semaphore = asyncio.Semaphore(1)
+            if self.args.interval_source == "entity":
+                for entity in entities:
+                    interval = getattr(entity, "SCAN_INTERVAL", DEFAULT_SCAN_INTERVAL)
+                    groups.append(PollGroup([entity], interval, semaphore))
+            else:
+                interval = getattr(sensor, "SCAN_INTERVAL", DEFAULT_SCAN_INTERVAL)
+                groups.append(PollGroup(entities, interval, semaphore))
+        return groups
+
+    def _timed_update(self, entity: Any) -> None:
+        self.counter.reset()
+        start = time.perf_counter()
+        try:
+            entity.update()
+        except Exception:  # noqa: BLE001 - updates are expected to log, not raise
+            logging.getLogger(SENSOR_LOGGER).exception("Update of %s raised", type(entity).__name__)
+        seconds = time.perf_counter() - start
+        with self._stats_lock:
+            self.update_times.append(seconds)
+            stats = self.update_stats.setdefault(type(entity).__name__, UpdateStats())
+            stats.count += 1
+            stats.seconds += seconds
+            stats.requests += self.counter.count()
+
+    def _project(self, groups: list[PollGroup]) -> tuple[float, dict[int, float]]:
+        """Project measured updates onto the real schedule.
+
+        Returns requests per real minute and the utilization of every entry.
+        """
+        requests_per_minute = 0.0
+        utilization: dict[int, float] = {}
+        for group in groups:
+            interval = group.interval.total_seconds()
+            entry = utilization.setdefault(id(group.semaphore), 0.0)
+            for entity in group.entities:
+                stats = self.update_stats.get(type(entity).__name__)
+                if stats is None or not stats.count:
+                    continue
+                requests_per_minute += stats.requests / stats.count * 60 / interval
+                entry += stats.seconds / stats.count / interval
+            utilization[id(group.semaphore)] = entry
+        return requests_per_minute, utilization
+
+    def _reset_measurements(self) -> None:
+        with self._stats_lock:
+            self.update_times.clear()
+            self.state_write_times.clear()
+            self.update_stats.clear()
+
+    async def _calibrate(self, groups: list[PollGroup]) -> float:
+        """Update every entity once and return a time scale that keeps up.
+
+        Entries run concurrently like in the real run, so the update
+        durations include executor and GIL contention for this entry count.
+        """
+        by_entry: dict[int, list[PollGroup]] = {}
+        for group in groups:
+            by_entry.setdefault(id(group.semaphore), []).append(group)
+
+        async def _cycle(entry_groups: list[PollGroup]) -> None:
+            for group in entry_groups:
+                await self._update_group(group)
+
+        await asyncio.gather(*(_cycle(g) for g in by_entry.values()))
+        _, utilization = self._project(groups)
+        self._reset_measurements()
+        utilization_max = max(utilization.values(), default=0.0)
+        if not utilization_max:
+            return DEFAULT_TIME_SCALE
+        # Keep the compressed interval at twice the time an entry needs; an
+        # entry that cannot keep up in real time runs uncompressed.
+        return max(1.0, min(DEFAULT_TIME_SCALE, 0.5 / utilization_max))
+
+    def _write_state(self, entity: Any) -> None:
+        """Serialize the new state on the event loop, like a state write."""
+        start = time.perf_counter()
+        json.dumps(
+            {"state": entity.native_value, "attributes": entity.extra_state_attributes},
+            default=str,
+        )
+        self.state_write_times.append(time.perf_counter() - start)
+
+    async def _update_group(self, group: PollGroup) -> None:
+        loop = asyncio.get_running_loop()
+        async with group.lock:
+
+            async def _run(entity: Any) -> None:
+                async with group.semaphore:
+                    if not self._stop.is_set():
+                        await loop.run_in_executor(self.executor, self._timed_update, entity)
+                        self._write_state(entity)
+
+            await asyncio.gather(*(_run(entity) for entity in group.entities))
+
+    async def _poll(self, group: PollGroup) -> None:
+        delay = group.interval.total_seconds() / self.scale
+        tasks: set[asyncio.Task] = set()
+        while not self._stop.is_set():
+            group.ticks += 1
+            if group.lock.locked():
+                group.skipped += 1
+            else:
+                task = asyncio.create_task(self._update_group(group))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        for task in tasks:
+            task.cancel()
+
+    async def _monitor_loop(self) -> None:
+        interval = self.args.lag_interval
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.lags.append(max(0.0, loop.time() - expected) * 1000)
+            # Private attribute, but the only way to see the backlog.
+            self.queue_depths.append(self.executor._work_queue.qsize())
+
+    async def _monitor_memory(self) -> None:
+        delay = self.sim_seconds / 24 / self.scale
+        while not self._stop.is_set():
+            self.memory_samples.append(await asyncio.get_running_loop().run_in_executor(None, _rss_kib))
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, sensor: Any, entries: int) -> RunResult:
+        loop = asyncio.get_running_loop()
+        memory_before = await loop.run_in_executor(None, _rss_kib)
+        groups = self._build_groups(sensor, entries)
+        # The calibration pass doubles as warm-up for the memory baseline.
+        scale = await self._calibrate(groups)
+        if self.scale is None:
+            self.scale = scale
+        self.sim_seconds = min(SIMULATED_DAY.total_seconds(), self.args.max_wall_seconds * self.scale)
+        memory_start = await loop.run_in_executor(None, _rss_kib)
+        # urlopen blocks; importing the integration enables HA's blocking IO check
+        requests_before = await loop.run_in_executor(None, _fetch_stats, self.base_url)
+        logger = logging.getLogger(SENSOR_LOGGER)
+        logger.addHandler(self.errors)
+
+        wall_start = time.perf_counter()
+        monitors = [
+            asyncio.create_task(self._monitor_loop()),
+            asyncio.create_task(self._monitor_memory()),
+        ]
+        pollers = [asyncio.create_task(self._poll(group)) for group in groups]
+
+        await asyncio.sleep(self.sim_seconds / self.scale)
+        self._stop.set()
+        await asyncio.gather(*pollers, *monitors)
+        wall_seconds = time.perf_counter() - wall_start
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        memory_end = await loop.run_in_executor(None, _rss_kib)
+        memory_peak = max([memory_start, memory_end, *self.memory_samples])
+        logger.removeHandler(self.errors)
+
+        requests_after = await loop.run_in_executor(None, _fetch_stats, self.base_url)
+        by_endpoint = {
+            path: count - requests_before.get(path, 0)
+            for path, count in sorted(requests_after.items())
+            if count - requests_before.get(path, 0)
+        }
+        requests_total = sum(by_endpoint.values())
+        lags = sorted(self.lags) or [0.0]
+
+        ticks = sum(g.ticks for g in groups)
+        ticks_skipped = sum(g.skipped for g in groups)
+        projected_requests, utilization = self._project(groups)
+        utilization_max = max(utilization.values(), default=0.0)
+        # Keep the compressed interval at twice the time an entry needs.
+        suggested_scale = round(0.5 / utilization_max, 1) if utilization_max else None
+        # Skipped ticks are only real when an entry cannot keep up uncompressed.
+        compression_dominated = (
+            ticks > 0 and ticks_skipped / ticks > 0.5 and utilization_max < 1.0
+        )
+        if compression_dominated:
+            lag_mean = lag_p99 = lag_max = queue_mean = queue_max = None
+        else:
+            lag_mean = round(statistics.fmean(lags), 2)
+            lag_p99 = round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 2)
+            lag_max = round(lags[-1], 2)
+            queue_mean = round(statistics.fmean(self.queue_depths), 1) if self.queue_depths else 0.0
+            queue_max = max(self.queue_depths, default=0)
+
+        return RunResult(
+            entries=entries,
+            entities=sum(len(g.entities) for g in groups),
+            wall_seconds=round(wall_seconds, 2),
+            time_scale=round(self.scale, 1),
+            simulated_hours=round(self.sim_seconds / 3600, 2),
+            updates_completed=len(self.update_times),
+            update_errors=self.errors.count,
+            ticks=ticks,
+            ticks_skipped=ticks_skipped,
+            update_seconds_mean=round(statistics.fmean(self.update_times), 4) if self.update_times else 0.0,
+            update_seconds_max=round(max(self.update_times, default=0.0), 4),
+            state_write_ms_mean=(
+                round(statistics.fmean(self.state_write_times) * 1000, 3) if self.state_write_times else 0.0
+            ),
+            state_write_ms_max=round(max(self.state_write_times, default=0.0) * 1000, 3),
+            loop_lag_ms_mean=lag_mean,
+            loop_lag_ms_p99=lag_p99,
+            loop_lag_ms_max=lag_max,
+            executor_queue_mean=queue_mean,
+            executor_queue_max=queue_max,
+            requests_total=requests_total,
+            requests_per_sim_minute=round(requests_total / (self.sim_seconds / 60), 1),
+            requests_per_wall_minute=round(requests_total / (wall_seconds / 60), 1),
+            requests_by_endpoint=by_endpoint,
+            projected_requests_per_minute=round(projected_requests, 1),
+            projected_entry_utilization_max=round(utilization_max, 3),
+            projected_executor_threads_busy=round(sum(min(u, 1.0) for u in utilization.values()), 2),
+            suggested_max_time_scale=suggested_scale,
+            compression_dominated=compression_dominated,
+            updates_by_sensor={
+                name: {
+                    "updates": stats.count,
+                    "seconds_mean": round(stats.seconds / stats.count, 4),
+                    "requests_per_update": round(stats.requests / stats.count, 1),
+                }
+                for name, stats in sorted(self.update_stats.items())
+            },
+            memory_entities_kib=round(memory_start - memory_before, 1),
+            memory_start_kib=round(memory_start, 1),
+            memory_end_kib=round(memory_end, 1),
+            memory_peak_kib=round(memory_peak, 1),
+            memory_growth_kib=round(memory_end - memory_start, 1),
+            memory_samples_kib=[round(m, 1) for m in self.memory_samples],
+        )
+
+
+def _instrument_sensor(sensor: Any, base_url: str) -> CountingRequests:
+    """Point the module level API URLs at the mock server and count requests."""
+    for attr, value in vars(sensor).copy().items():
+        if attr.startswith("API_") and isinstance(value, str) and value.startswith(STEAM_API_BASE):
+            setattr(sensor, attr, base_url + value[len(STEAM_API_BASE):])
+    counter = CountingRequests(sensor.requests)
+    sensor.requests = counter
+    return counter
+
+
+def _print_result(result: RunResult) -> None:
+    print(
+        f"\n== {result.entries} entries / {result.entities} entities: {result.simulated_hours}h simulated "
+        f"at time scale {result.time_scale} ({result.wall_seconds}s wall) =="
+    )
+    print(
+        f"updates: {result.updates_completed} completed, {result.update_errors} errors logged, "
+        f"{result.ticks_skipped}/{result.ticks} ticks skipped (previous update still running)"
+    )
+    print(f"update duration: mean {result.update_seconds_mean}s, max {result.update_seconds_max}s")
+    print(f"state write on the loop: mean {result.state_write_ms_mean}ms, max {result.state_write_ms_max}ms")
+    if result.compression_dominated:
+        print("event loop lag, executor queue: not reported, the run was saturated by --time-scale")
+    else:
+        print(
+            f"event loop lag: mean {result.loop_lag_ms_mean}ms, p99 {result.loop_lag_ms_p99}ms, "
+            f"max {result.loop_lag_ms_max}ms"
+        )
+        print(f"executor queue: mean {result.executor_queue_mean}, max {result.executor_queue_max}")
+    print(
+        f"requests: {result.requests_total} total, {result.requests_per_sim_minute}/simulated min, "
+        f"{result.requests_per_wall_minute}/wall min"
+    )
+    for path, count in result.requests_by_endpoint.items():
+        print(f"  {path}: {count}")
+    print("projected onto the real schedule:")
+    print(f"  requests: {result.projected_requests_per_minute}/min")
+    print(
+        f"  entry utilization: {result.projected_entry_utilization_max} "
+        f"(>= 1 means polls are skipped even without compression)"
+    )
+    print(f"  executor threads busy: {result.projected_executor_threads_busy}")
+    for name, stats in result.updates_by_sensor.items():
+        print(
+            f"  {name}: {stats['requests_per_update']} requests, "
+            f"{stats['seconds_mean']}s per update ({stats['updates']} updates)"
+        )
+    print(
+        f"memory (RSS): entities and warm-up +{result.memory_entities_kib} KiB, then start "
+        f"{result.memory_start_kib} KiB, end {result.memory_end_kib} KiB, peak {result.memory_peak_kib} KiB, "
+        f"growth {result.memory_growth_kib} KiB"
+    )
+    if result.compression_dominated:
+        print(
+            f"WARNING: {result.ticks_skipped}/{result.ticks} ticks skipped; the measurements are "
+            f"dominated by --time-scale. Use the projected figures or rerun with "
+            f"--time-scale {result.suggested_max_time_scale} or lower (or auto).",
+            file=sys.stderr,
+        )
+
+
+def _time_scale(value: str) -> float | None:
+    if value == "auto":
+        return None
+    scale = float(value)
+    if scale <= 0:
+        raise argparse.ArgumentTypeError("time scale must be positive")
+    return scale
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--entries",
+        default="1,5,10,25,50",
+        help="comma separated list of config entry counts to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=_time_scale,
+        default=None,
+        help=(
+            "simulated seconds per wall second, 1440 runs a day in one minute; "
+            "'auto' calibrates a scale at which entries keep up (default: auto)"
+        ),
+    )
+    parser.add_argument(
+        "--max-wall-seconds",
+        type=float,
+        default=300,
+        help="shorten the simulated day so a run takes at most this long (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--interval-source",
+        choices=("platform", "entity"),
+        default="platform",
+        help="poll on the platform SCAN_INTERVAL like Home Assistant, or on each entity's (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(32, (os.cpu_count() or 1) + 4),
+        help="executor worker threads (default: %(default)s)",
+    )
+    parser.add_argument("--games", type=int, default=200, help="owned games per account (default: %(default)s)")
+    parser.add_argument("--achievements", type=int, default=30, help="achievements per game (default: %(default)s)")
+    parser.add_argument("--friends", type=int, default=50, help="friends per account (default: %(default)s)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="mock API latency per request (default: %(default)s)")
+    parser.add_argument(
+        "--lag-interval",
+        type=float,
+        default=0.05,
+        help="event loop lag probe interval in wall seconds (default: %(default)s)",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    entry_counts = [int(n) for n in args.entries.split(",") if n.strip()]
+
+    from custom_components.steam_tracker import sensor
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=_serve,
+        args=(ready, args.games, args.achievements, args.friends, args.latency_ms),
+        daemon=True,
+    )
+    server.start()
+    base_url = f"http://127.0.0.1:{ready.get(timeout=10)}"
+    counter = _instrument_sensor(sensor, base_url)
+
+    results = []
+    try:
+        for entries in entry_counts:
+            result = asyncio.run(LoadTest(args, base_url, counter).run(sensor, entries))
+            results.append(result)
+            if not args.json:
+                _print_result(result)
+            elif result.compression_dominated:
+                print(
+                    f"WARNING: {result.entries} entries: {result.ticks_skipped}/{result.ticks} ticks "
+                    f"skipped, measured figures are dominated by --time-scale",
+                    file=sys.stderr,
+                )
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json:
+        print(json.dumps([vars(r) for r in results], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Tests for the Steam Tracker integration."""
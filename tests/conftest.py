@@ -0,0 +1,57 @@
+"""Fixtures for Steam Tracker tests."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.steam_tracker.const import CONF_STEAM_ID, DOMAIN
+from homeassistant.const import CONF_API_KEY, CONF_NAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+STEAM_ID = "76561198000000001"
+
+
+class FakeResponse:
+    """Minimal stand-in for ``requests.Response``."""
+
+    def __init__(self, payload: dict[str, Any] | None = None, status_code: int = 200) -> None:
+        self._payload = payload or {}
+        self.status_code = status_code
+        self.ok = status_code < 400
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Steam Tracker",
+        unique_id=STEAM_ID,
+        data={CONF_STEAM_ID: STEAM_ID, CONF_API_KEY: "key", CONF_NAME: "Steam Tracker"},
+    )
+
+
+@pytest.fixture
+def steam_api():
+    """Patch ``requests.get`` in the sensor module with a harmless reply."""
+    payload = {
+        "response": {"players": [{"personastate": 1, "personaname": "player"}], "games": []},
+        "playerstats": {"achievements": []},
+        "friendslist": {"friends": []},
+    }
+    with patch(
+        "custom_components.steam_tracker.sensor.requests.get",
+        return_value=FakeResponse(payload),
+    ) as mock_get:
+        yield mock_get
@@ -0,0 +1,146 @@
+"""Tests for the update profiler."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.steam_tracker.profiling import PhaseStats, UpdateProfiler, profiled_update
+
+
+@pytest.fixture
+def profiler(tmp_path) -> UpdateProfiler:
+    hass = SimpleNamespace(config=SimpleNamespace(path=lambda *parts: str(tmp_path.joinpath(*parts))))
+    return UpdateProfiler(hass)
+
+
+class FakeSensor:
+    """Sensor-like object with a profiled update."""
+
+    entity_id = "sensor.steam_tracker_status"
+    unique_id = "1_status"
+
+    def __init__(self, profiler: UpdateProfiler) -> None:
+        self.profiler = profiler
+        self._profile_cycle = None
+        self.updates = 0
+
+    @profiled_update
+    def update(self) -> None:
+        self.updates += 1
+
+
+class BusyProfile:
+    """cProfile.Profile while another profiling tool is active (3.12+)."""
+
+    def enable(self) -> None:
+        raise ValueError("Another profiling tool is already active")
+
+
+def test_capture_skipped_when_another_profiler_is_active(profiler, tmp_path, caplog) -> None:
+    sensor = FakeSensor(profiler)
+    profiler.request_capture([sensor.entity_id])
+
+    with patch("custom_components.steam_tracker.profiling.cProfile.Profile", BusyProfile):
+        sensor.update()
+
+    assert sensor.updates == 1
+    assert not tmp_path.joinpath("steam_tracker").exists()
+    assert "Not capturing a profile" in caplog.text
+    # the lock is free again for the next capture
+    profiler.request_capture([sensor.entity_id])
+    sensor.update()
+    assert len(list(tmp_path.joinpath("steam_tracker", "profiles").iterdir())) == 1
+
+
+class SpanSensor(FakeSensor):
+    """Sensor whose update spends known time in fetch and decode."""
+
+    def __init__(self, profiler: UpdateProfiler, clock: list[float]) -> None:
+        super().__init__(profiler)
+        self._clock = clock
+
+    @profiled_update
+    def update(self) -> None:
+        with self._profile_cycle.span("fetch"):
+            self._clock[0] += 0.5
+        with self._profile_cycle.span("decode"):
+            self._clock[0] += 0.25
+        self._clock[0] += 0.125
+
+
+def test_phase_stats_aggregate() -> None:
+    stats = PhaseStats()
+    for seconds in (0.010, 0.030, 0.020):
+        stats.add(seconds)
+
+    assert stats.as_dict() == {"count": 3, "mean_ms": 20.0, "max_ms": 30.0, "last_ms": 20.0}
+    assert PhaseStats().as_dict()["mean_ms"] == 0.0
+
+
+def test_compute_is_total_minus_fetch_and_decode(profiler) -> None:
+    clock = [0.0]
+    sensor = SpanSensor(profiler, clock)
+    profiler.set_enabled(True)
+
+    with patch(
+        "custom_components.steam_tracker.profiling.time.perf_counter",
+        side_effect=lambda: clock[0],
+    ):
+        sensor.update()
+
+    phases = profiler.stats()[sensor.entity_id]
+    assert phases["fetch"]["last_ms"] == 500.0
+    assert phases["decode"]["last_ms"] == 250.0
+    assert phases["compute"]["last_ms"] == 125.0
+    assert phases["total"]["last_ms"] == 875.0
+
+
+def test_set_enabled_clears_old_stats(profiler) -> None:
+    sensor = FakeSensor(profiler)
+    sensor.update()
+    assert profiler.stats() == {}
+
+    profiler.set_enabled(True)
+    sensor.update()
+    assert profiler.stats()[sensor.entity_id]["total"]["count"] == 1
+
+    # switching on again while enabled keeps the stats
+    profiler.set_enabled(True)
+    assert profiler.stats()[sensor.entity_id]["total"]["count"] == 1
+
+    profiler.set_enabled(False)
+    sensor.update()
+    assert profiler.stats()[sensor.entity_id]["total"]["count"] == 1
+
+    profiler.set_enabled(True)
+    assert profiler.stats() == {}
+
+
+def test_take_capture_claims_once_and_waits_while_busy(profiler) -> None:
+    entity_id = "sensor.steam_tracker_status"
+    assert profiler._take_capture(entity_id) is None
+
+    profiler.request_capture([entity_id, "sensor.steam_tracker_game"])
+    first = profiler._take_capture(entity_id)
+    assert first is not None
+    # claimed once
+    assert profiler._take_capture(entity_id) is None
+
+    # busy: the other request stays pending
+    assert profiler._take_capture("sensor.steam_tracker_game") is None
+    assert profiler.wants("sensor.steam_tracker_game")
+
+    profiler._cprofile_lock.release()
+    assert profiler._take_capture("sensor.steam_tracker_game") is not None
+    profiler._cprofile_lock.release()
+    assert not profiler.wants("sensor.steam_tracker_game")
+
+
+def test_request_capture_without_entities_takes_the_next_update(profiler) -> None:
+    profiler.request_capture()
+    assert profiler._take_capture("sensor.any") is not None
+    profiler._cprofile_lock.release()
+    assert profiler._take_capture("sensor.other") is None
@@ -0,0 +1,26 @@
+"""Tests for profiling sensor updates polled by Home Assistant."""
+
+from datetime import timedelta
+
+from custom_components.steam_tracker.const import DATA_PROFILER, DOMAIN, SERVICE_SET_PROFILING
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+
+async def test_polled_update_records_all_phases(
+    hass: HomeAssistant, enable_custom_integrations, config_entry, steam_api
+) -> None:
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(DOMAIN, SERVICE_SET_PROFILING, {"enabled": True}, blocking=True)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
+    await hass.async_block_till_done()
+
+    stats = hass.data[DATA_PROFILER].stats()
+    phases = stats["sensor.steam_tracker_status"]
+    assert set(phases) == {"fetch", "decode", "compute", "total", "state_write"}
+    assert phases["state_write"]["count"] == 1
+    assert phases["total"]["count"] == 1
@@ -0,0 +1,156 @@
+"""Tests for the recent unlocks sensor."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.steam_tracker import sensor as steam_sensor
+from custom_components.steam_tracker.sensor import SteamRecentUnlocksSensor
+
+from .conftest import STEAM_ID, FakeResponse
+
+
+class FakeSteam:
+    """Serve owned games and achievements for ``requests.get``."""
+
+    def __init__(self) -> None:
+        self.games: list[dict[str, Any]] = []
+        self.achievements: dict[int, FakeResponse] = {}
+        self.calls: list[tuple[str, Any]] = []
+
+    def add_game(self, appid: int, playtime: int, unlocktimes: tuple[int, ...] = ()) -> None:
+        self.games.append({"appid": appid, "name": f"Game {appid}", "playtime_forever": playtime})
+        self.set_achievements(appid, unlocktimes)
+
+    def set_achievements(self, appid: int, unlocktimes: tuple[int, ...]) -> None:
+        achievements = [
+            {"apiname": f"ACH_{t}", "achieved": 1, "unlocktime": t} for t in unlocktimes
+        ]
+        self.achievements[appid] = FakeResponse({"playerstats": {"success": True, "achievements": achievements}})
+
+    def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> FakeResponse:
+        params = params or {}
+        self.calls.append((url, params.get("appid")))
+        if url == steam_sensor.API_OWNED_GAMES:
+            return FakeResponse({"response": {"games": self.games}})
+        return self.achievements[params["appid"]]
+
+    def achievement_calls(self) -> list[Any]:
+        return [appid for url, appid in self.calls if url == steam_sensor.API_ACHIEVEMENTS]
+
+
+@pytest.fixture
+def steam() -> FakeSteam:
+    fake = FakeSteam()
+    with patch("custom_components.steam_tracker.sensor.requests.get", side_effect=fake.get):
+        yield fake
+
+
+@pytest.fixture
+def unlocks_sensor() -> SteamRecentUnlocksSensor:
+    return SteamRecentUnlocksSensor("key", STEAM_ID, "Steam Tracker Recent Unlocks")
+
+
+def test_update_is_throttled_to_the_scan_interval(steam, unlocks_sensor) -> None:
+    steam.add_game(10, 100, (1000,))
+
+    with patch("custom_components.steam_tracker.sensor.time.monotonic", return_value=1000.0):
+        unlocks_sensor.update()
+    assert len(steam.calls) == 2
+
+    with patch("custom_components.steam_tracker.sensor.time.monotonic", return_value=1000.0 + 30):
+        unlocks_sensor.update()
+    assert len(steam.calls) == 2
+
+    with patch("custom_components.steam_tracker.sensor.time.monotonic", return_value=1000.0 + 3600):
+        unlocks_sensor.update()
+    assert len(steam.calls) == 3
+
+
+def test_update_backfills_faster_while_games_are_pending(steam, unlocks_sensor) -> None:
+    for appid in range(1, 61):
+        steam.add_game(appid, 100)
+
+    with patch("custom_components.steam_tracker.sensor.time.monotonic", return_value=1000.0):
+        unlocks_sensor.update()
+    assert unlocks_sensor.extra_state_attributes["games_pending"] == 10
+
+    with patch("custom_components.steam_tracker.sensor.time.monotonic", return_value=1000.0 + 300):
+        unlocks_sensor.update()
+    assert unlocks_sensor.extra_state_attributes["games_pending"] == 0
+    assert unlocks_sensor.extra_state_attributes["games_indexed"] == 60
+
+
+def _scan(unlocks_sensor: SteamRecentUnlocksSensor) -> dict[str, Any]:
+    """Run a scan regardless of the throttle and return the attributes."""
+    unlocks_sensor._last_scan = None
+    unlocks_sensor.update()
+    return unlocks_sensor.extra_state_attributes
+
+
+def test_no_stats_reply_clears_the_games_unlocks(steam, unlocks_sensor) -> None:
+    steam.add_game(10, 100, (1000, 2000))
+    steam.add_game(20, 100, (1500,))
+    assert _scan(unlocks_sensor)["unlocks_total"] == 3
+
+    steam.games[0]["playtime_forever"] = 150
+    steam.achievements[10] = FakeResponse(
+        {"playerstats": {"success": False, "error": "Requested app has no stats"}}, 400
+    )
+    attrs = _scan(unlocks_sensor)
+    assert attrs["unlocks_total"] == 1
+    assert [u["appid"] for u in attrs["recent_unlocks"]] == [20]
+    assert attrs["games_scanned"] == 1
+
+    # recorded as scanned, so not fetched again
+    steam.calls.clear()
+    _scan(unlocks_sensor)
+    assert steam.achievement_calls() == []
+
+
+@pytest.mark.parametrize("status", [401, 403, 429, 500])
+def test_error_reply_keeps_unlocks_and_rescans(steam, unlocks_sensor, status) -> None:
+    steam.add_game(10, 100, (1000, 2000))
+    assert _scan(unlocks_sensor)["unlocks_total"] == 2
+
+    steam.games[0]["playtime_forever"] = 150
+    steam.achievements[10] = FakeResponse({"playerstats": {"success": False}}, status)
+    attrs = _scan(unlocks_sensor)
+    assert attrs["unlocks_total"] == 2
+    assert attrs["games_scanned"] == 0
+
+    steam.set_achievements(10, (1000, 2000, 3000))
+    steam.calls.clear()
+    attrs = _scan(unlocks_sensor)
+    assert steam.achievement_calls() == [10]
+    assert attrs["unlocks_total"] == 3
+    assert attrs["recent_unlocks"][0]["unlocktime"] == 3000
+
+
+def test_never_played_games_are_recorded_without_fetch(steam, unlocks_sensor) -> None:
+    steam.add_game(10, 0)
+    steam.add_game(20, 100, (1000,))
+
+    attrs = _scan(unlocks_sensor)
+    assert steam.achievement_calls() == [20]
+    assert attrs["games_indexed"] == 2
+    assert attrs["games_scanned"] == 2
+
+
+def test_games_pending_over_the_scan_limit(steam, unlocks_sensor) -> None:
+    for appid in range(1, 76):
+        steam.add_game(appid, 100, (appid,))
+
+    attrs = _scan(unlocks_sensor)
+    assert len(steam.achievement_calls()) == 50
+    assert attrs["games_pending"] == 25
+    assert attrs["unlocks_total"] == 50
+
+    steam.calls.clear()
+    attrs = _scan(unlocks_sensor)
+    assert len(steam.achievement_calls()) == 25
+    assert attrs["games_pending"] == 0
+    assert attrs["unlocks_total"] == 75
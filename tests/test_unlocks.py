@@ -0,0 +1,73 @@
+"""Tests for the achievement unlock index."""
+
+from custom_components.steam_tracker.unlocks import UnlockIndex
+
+
+def _game(appid, playtime, last_played=0):
+    return {
+        "appid": appid,
+        "name": f"Game {appid}",
+        "playtime_forever": playtime,
+        "rtime_last_played": last_played,
+    }
+
+
+def _unlock(appid, unlocktime):
+    return {"appid": appid, "apiname": f"ACH_{unlocktime}", "unlocktime": unlocktime}
+
+
+def test_changed_games_only_returns_new_or_played_games():
+    index = UnlockIndex()
+    games = [_game(10, 100, last_played=1), _game(20, 50, last_played=2), _game(30, 0)]
+
+    # unknown games are all changed, most recently played first
+    assert [g["appid"] for g in index.changed_games(games)] == [20, 10, 30]
+
+    index.apply(games, {"10": [], "20": []})
+    assert index.changed_games(games) == []
+
+    games[0]["playtime_forever"] = 150
+    assert [g["appid"] for g in index.changed_games(games)] == [10]
+
+
+def test_apply_replaces_unlocks_of_scanned_games_only():
+    index = UnlockIndex()
+    index.apply(
+        [_game(10, 100), _game(20, 50)],
+        {"10": [_unlock(10, 100), _unlock(10, 300)], "20": [_unlock(20, 200)]},
+    )
+    assert [u["unlocktime"] for u in index.unlocks] == [300, 200, 100]
+
+    index.apply([_game(10, 150)], {"10": [_unlock(10, 100), _unlock(10, 300), _unlock(10, 400)]})
+    assert [u["unlocktime"] for u in index.unlocks] == [400, 300, 200, 100]
+    assert index.games["10"]["playtime"] == 150
+    assert index.games["20"]["playtime"] == 50
+
+
+def test_apply_without_result_keeps_existing_unlocks():
+    index = UnlockIndex()
+    index.apply([_game(10, 100)], {"10": [_unlock(10, 100)]})
+
+    index.apply([_game(10, 150)], {})
+    assert [u["unlocktime"] for u in index.unlocks] == [100]
+    assert index.games["10"]["playtime"] == 150
+
+
+def test_count_since_and_recent():
+    index = UnlockIndex()
+    index.apply([_game(10, 100)], {"10": [_unlock(10, t) for t in (100, 200, 300, 400)]})
+
+    assert index.count_since(250) == 2
+    assert index.count_since(400) == 1
+    assert index.count_since(500) == 0
+    assert index.count_since(0) == 4
+    assert [u["unlocktime"] for u in index.recent(2)] == [400, 300]
+
+
+def test_round_trip_through_storage_dict():
+    index = UnlockIndex()
+    index.apply([_game(10, 100)], {"10": [_unlock(10, 100)]})
+
+    restored = UnlockIndex.from_dict(index.as_dict())
+    assert restored.games == index.games
+    assert restored.unlocks == index.unlocks